@@ -1,4 +1,4 @@
-from setuptools import setup
+from setuptools import setup, find_packages
 
 setup(
     name = "storage-controllers",
@@ -8,7 +8,11 @@ setup(
     description = ("README.md"),
     license = "Apache License 2.0",
     url = "https://github.com/dvaleriani/storage-controllers",
-    packages=['storage_controllers'],
+    packages=find_packages(exclude=['tests']),
+    extras_require = {
+        'analytics': ['numpy'],
+        'arrow': ['pyarrow']
+    },
     classifiers = [
         "Development Status :: 1 - Planning",
         "Topic :: Utilities",
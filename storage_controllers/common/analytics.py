@@ -0,0 +1,143 @@
+# Copyright (c) 2013 Daniele Valeriani (daniele@dvaleriani.net).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Fleet reports computed over an inventory.Inventory. Every group by works
+# on the integer codes of the columns, so nothing loops over the drives in
+# Python.
+
+from storage_controllers.common import inventory
+
+np = inventory.np
+
+
+def _codes(inv, field):
+    """
+    Returns the integer codes of a field and the labels they refer to.
+    Non category fields (es: size) are encoded on the fly.
+    """
+    if field in inv.dictionaries:
+        return inv.data[field].astype(np.int64), inv.dictionaries[field]
+    labels, codes = np.unique(inv.data[field], return_inverse=True)
+    return codes.astype(np.int64), labels.tolist()
+
+
+def _group(inv, keys):
+    """
+    Assign each row a group number.
+
+    :returns: The group number of each row, and a list of dicts with the
+              labels of each group.
+    """
+    inventory._check_numpy()
+    key = np.zeros(len(inv), dtype=np.int64)
+    encoded = []
+    for field in keys:
+        codes, labels = _codes(inv, field)
+        # Compact the key after every field, so it never grows past
+        # rows * labels and cannot overflow whatever the number of keys.
+        key = key * max(len(labels), 1) + codes
+        key = np.unique(key, return_inverse=True)[1].reshape(-1)
+        encoded.append((field, codes, labels))
+    groups, first, rows = np.unique(key, return_index=True,
+                                    return_inverse=True)
+    result = [{} for _ in groups]
+    for field, codes, labels in encoded:
+        for group, code in zip(result, codes[first].tolist()):
+            group[field] = labels[code]
+    return rows.reshape(-1), result
+
+
+def count_by(inv, keys):
+    """
+    Count the drives for each combination of the given fields.
+
+    :param inv: An Inventory instance.
+    :param keys: A list of field names. Es: ['model', 'firmware'].
+    :returns: A list of dicts with the key fields and 'drives'.
+    """
+    rows, groups = _group(inv, keys)
+    counts = np.bincount(rows, minlength=len(groups))
+    for group, count in zip(groups, counts.tolist()):
+        group['drives'] = count
+    return groups
+
+
+def failure_rate(inv, keys=('model', 'firmware'), field='status',
+                 failed=('Failed',)):
+    """
+    Compute the failure rate for each combination of the given fields.
+
+    :param inv: An Inventory instance.
+    :param keys: A list of field names to group by.
+    :param field: The field telling whether a drive failed.
+    :param failed: The values of that field that count as a failure.
+    :returns: A list of dicts with the key fields, 'drives', 'failed' and
+              'rate'.
+    """
+    rows, groups = _group(inv, keys)
+    codes, labels = _codes(inv, field)
+    failed_codes = [i for i, label in enumerate(labels) if label in failed]
+    is_failed = np.isin(codes, failed_codes)
+    counts = np.bincount(rows, minlength=len(groups))
+    failures = np.bincount(rows, weights=is_failed, minlength=len(groups))
+    for group, count, failure in zip(groups, counts.tolist(),
+                                     failures.tolist()):
+        group['drives'] = count
+        group['failed'] = int(failure)
+        group['rate'] = failure / count if count else 0.0
+    return groups
+
+
+def capacity_by(inv, keys):
+    """
+    Sum the size of the drives for each combination of the given fields.
+    Drives with an unknown size are counted in 'unsized', not in 'capacity'.
+
+    :param inv: An Inventory instance of physical drives.
+    :param keys: A list of field names. Es: ['size'] for size classes.
+    :returns: A list of dicts with the key fields, 'drives', 'unsized' and
+              'capacity'.
+    """
+    rows, groups = _group(inv, keys)
+    sizes = inv.data['size']
+    unsized = np.isnan(sizes)
+    counts = np.bincount(rows, minlength=len(groups))
+    missing = np.bincount(rows, weights=unsized, minlength=len(groups))
+    totals = np.bincount(rows, weights=np.where(unsized, 0, sizes),
+                         minlength=len(groups))
+    for group, count, unknown, size in zip(groups, counts.tolist(),
+                                           missing.tolist(), totals.tolist()):
+        group['drives'] = count
+        group['unsized'] = int(unknown)
+        group['capacity'] = size
+    return groups
+
+
+def health_summary(inv):
+    """
+    Summarise the health of the fleet.
+
+    :param inv: An Inventory instance of physical or logical drives.
+    :returns: A dict with the total number of drives, the minions left out
+              and the number of drives for each status (and state, for
+              physical drives).
+    """
+    summary = {'drives': len(inv), 'skipped': list(inv.skipped)}
+    for field in ('status', 'state'):
+        if field not in inv.dictionaries:
+            continue
+        summary[field] = dict((group[field], group['drives'])
+                              for group in count_by(inv, [field]))
+    return summary
@@ -0,0 +1,196 @@
+# Copyright (c) 2013 Daniele Valeriani (daniele@dvaleriani.net).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Columnar export of the drive records returned by the controller modules.
+# The get_info() dicts of many minions are turned into a single NumPy
+# structured array, with every string field dictionary encoded: the array
+# holds integer codes and the distinct values live in a separate list, the
+# same layout used by Arrow dictionary arrays.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from storage_controllers.common import exceptions
+
+
+# Field name, kind. 'category' fields are dictionary encoded, 'count' fields
+# store the length of a list, anything else is a NumPy dtype.
+PHYSICAL_DRIVE_FIELDS = (
+    ('minion', 'category'),
+    ('controller_id', 'category'),
+    ('id', 'category'),
+    ('model', 'category'),
+    ('firmware', 'category'),
+    ('serial', 'category'),
+    ('size', 'float64'),
+    ('state', 'category'),
+    ('status', 'category'),
+)
+
+LOGICAL_DRIVE_FIELDS = (
+    ('minion', 'category'),
+    ('controller_id', 'category'),
+    ('id', 'category'),
+    ('name', 'category'),
+    ('device_path', 'category'),
+    ('physical_drives', 'count'),
+    ('status', 'category'),
+    ('type', 'category'),
+)
+
+
+def _check_numpy():
+    if np is None:
+        raise exceptions.ControllerError("NumPy is required to build a "
+                                         "drive inventory")
+
+
+def flatten(records):
+    """
+    Turn the output of controller.physical_drive or controller.logical_drive
+    into a flat list of records, tagging each one with its minion.
+
+    :param records: Either a list of get_info() dicts or a dict of minion id
+                    to the salt return of that minion: a list of get_info()
+                    dicts, a single get_info() dict when a drive id was
+                    given, or an error dict.
+    :returns: The list of records and the sorted list of minions that
+              returned an error instead of drive information.
+    """
+    if not isinstance(records, dict):
+        return list(records), []
+    flat = []
+    skipped = []
+    for minion, entries in records.items():
+        if isinstance(entries, dict) and 'id' in entries:
+            entries = [entries]
+        if not isinstance(entries, list):
+            skipped.append(minion)
+            continue
+        for entry in entries:
+            entry = dict(entry)
+            entry['minion'] = minion
+            flat.append(entry)
+    return flat, sorted(skipped)
+
+
+class Inventory():
+    def __init__(self, data, dictionaries, skipped=None):
+        """
+        A columnar drive inventory.
+
+        :param data: A NumPy structured array, one row per drive.
+        :param dictionaries: A dict of field name to the list of distinct
+                             values the codes of that field refer to.
+        :param skipped: The minions left out because they returned an error.
+        """
+        self.data = data
+        self.dictionaries = dictionaries
+        self.skipped = skipped or []
+
+    def __len__(self):
+        return len(self.data)
+
+    def decode(self, field):
+        '''
+        Returns the values of a field, decoding it if it is a category.
+        '''
+        if field in self.dictionaries:
+            return np.array(self.dictionaries[field],
+                            dtype=object)[self.data[field]]
+        return self.data[field]
+
+    def to_arrow(self):
+        '''
+        Returns a pyarrow Table, with categories as DictionaryArrays.
+        '''
+        import pyarrow as pa
+        columns = []
+        for field in self.data.dtype.names:
+            if field in self.dictionaries:
+                columns.append(pa.DictionaryArray.from_arrays(
+                    np.ascontiguousarray(self.data[field]),
+                    pa.array(self.dictionaries[field], type=pa.string())))
+            else:
+                columns.append(pa.array(
+                    np.ascontiguousarray(self.data[field])))
+        return pa.Table.from_arrays(columns, names=list(self.data.dtype.names))
+
+
+def _value(record, field, kind):
+    value = record.get(field)
+    if kind == 'category':
+        return '' if value is None else str(value)
+    if value is None:
+        if kind == 'float64':
+            return float('nan')
+        raise exceptions.ControllerError("Drive record {0} has no {1} "
+                                         "field".format(record.get('id'),
+                                                        field))
+    if kind == 'count':
+        return len(value)
+    return value
+
+
+def build(records, fields):
+    """
+    Build an Inventory out of a list of drive records.
+
+    :param records: Anything flatten() accepts.
+    :param fields: The field specification, PHYSICAL_DRIVE_FIELDS or
+                   LOGICAL_DRIVE_FIELDS.
+    :returns: An Inventory instance.
+    """
+    _check_numpy()
+    records, skipped = flatten(records)
+    dtype = []
+    columns = {}
+    dictionaries = {}
+    for field, kind in fields:
+        values = [_value(r, field, kind) for r in records]
+        if kind == 'category':
+            index = {}
+            columns[field] = [index.setdefault(v, len(index)) for v in values]
+            categories = [None] * len(index)
+            for value, code in index.items():
+                categories[code] = value
+            dictionaries[field] = categories
+            dtype.append((field, 'int32'))
+        elif kind == 'count':
+            columns[field] = values
+            dtype.append((field, 'int32'))
+        else:
+            columns[field] = values
+            dtype.append((field, kind))
+    data = np.empty(len(records), dtype=dtype)
+    for field, kind in fields:
+        data[field] = columns[field]
+    return Inventory(data, dictionaries, skipped)
+
+
+def physical_drives(records):
+    """
+    Build an Inventory out of controller.physical_drive output.
+    """
+    return build(records, PHYSICAL_DRIVE_FIELDS)
+
+
+def logical_drives(records):
+    """
+    Build an Inventory out of controller.logical_drive output.
+    """
+    return build(records, LOGICAL_DRIVE_FIELDS)
@@ -98,6 +98,123 @@ def _check_exit_code(result, error):
         raise exceptions.ControllerError(error)
 
 
+def _lookup(mapping):
+    """
+    Returns a converter translating an OMSA code through the given mapping.
+    Codes missing from the mapping are returned as they are.
+    """
+    return lambda code: mapping.get(code, code)
+
+
+def _size(value):
+    # For some reason the perc controller reports size in decimal, not binary
+    return int(value) / 1000000000000
+
+
+# OMSA ObjStatus codes
+LOGICAL_DRIVE_STATUS = {
+    '1': "Other",
+    '2': "Online",
+    '3': "Degraded",
+    '4': "Failed",
+    '5': "Non-Recoverable"
+}
+
+PHYSICAL_DRIVE_STATUS = {
+    '1': "Other",
+    '2': "Ok",
+    '3': "Non-Critical",
+    '4': "Failed",
+    '5': "Non-Recoverable"
+}
+
+# OMSA ObjState bits. Codes are matched as a whole, so a state reported as
+# a combination of bits is not split and comes back as the raw value.
+PHYSICAL_DRIVE_STATE = {
+    '0': "Unknown",
+    '1': "Ready",
+    '2': "Failed",
+    '4': "Online",
+    '8': "Offline",
+    '32': "Degraded",
+    '64': "Recovering",
+    '128': "Removed",
+    '512': "Not Ready",
+    '1024': "Resynching",
+    '2048': "Replacing",
+    '4096': "Spinning Down",
+    '8192': "Rebuilding",
+    '16384': "No Media",
+    '32768': "Formatting",
+    '65536': "Diagnostics",
+    '131072': "Predictive Failure",
+    '262144': "Initializing"
+}
+
+# OMSA Layout bits. As with ObjState, combined bits come back raw.
+RAID_LAYOUT = {
+    '1': "Concatenated",
+    '2': "RAID-0",
+    '4': "RAID-1",
+    '8': "RAID-2",
+    '16': "RAID-3",
+    '32': "RAID-4",
+    '64': "RAID-5",
+    '128': "RAID-6",
+    '256': "RAID-7",
+    '512': "RAID-10",
+    '1024': "RAID-30",
+    '2048': "RAID-50",
+    '262144': "RAID-60"
+}
+
+# Element tag: (attribute, converter). None keeps the text as it is.
+LOGICAL_DRIVE_SCHEMA = {
+    'LogicalDriveNum': ('id', None),
+    'DeviceName': ('device_path', None),
+    'ObjStatus': ('status', _lookup(LOGICAL_DRIVE_STATUS)),
+    'Layout': ('type', _lookup(RAID_LAYOUT))
+}
+
+PHYSICAL_DRIVE_SCHEMA = {
+    'Channel': ('channel', None),
+    'TargetID': ('target_id', None),
+    'Revision': ('firmware', None),
+    'Length': ('size', _size),
+    'ProductID': ('model', None),
+    'DeviceSerialNumber': ('serial', None),
+    'ObjState': ('state', _lookup(PHYSICAL_DRIVE_STATE)),
+    'ObjStatus': ('status', _lookup(PHYSICAL_DRIVE_STATUS))
+}
+
+
+def _extract(xml_input, schema, error):
+    """
+    Walk the children of an element once and convert the ones listed in the
+    schema.
+
+    :param xml_input: The xml to parse.
+    :param schema: A dict of element tag to (attribute, converter).
+    :param error: The exception to raise if a field is missing.
+    :returns: A dict of attribute to converted value.
+    """
+    values = {}
+    for child in xml_input:
+        field = schema.get(child.tag)
+        if field is not None:
+            attribute, convert = field
+            if convert is None:
+                values[attribute] = child.text
+            else:
+                values[attribute] = convert(child.text)
+    if len(values) != len(schema):
+        missing = [tag for tag, field in schema.items()
+                   if field[0] not in values]
+        raise error("Missing fields in the omreport output: "
+                    "{0}".format(', '.join(sorted(missing))))
+    return values
+
+
 def _parse_logical_drive(xml_input, logical_drive):
     """
     Parse the xml returned by the omreport command and assign attributes to
@@ -106,21 +223,10 @@ def _parse_logical_drive(xml_input, logical_drive):
     :param xml_input: The xml to parse.
     :param logical_drive: The logical drive object to act on.
     """
-    logical_drive.id = xml_input.find('LogicalDriveNum').text
-    logical_drive.device_path = xml_input.find('DeviceName').text
-
-    status_mapping = {
-        '2': "Online",
-        '4': "Failed"
-    }
-    logical_drive.status = status_mapping[xml_input.find('ObjStatus').text]
-
-    raid_mapping = {
-        '2': "RAID-0",
-        '4': "RAID-1"
-    }
-    logical_drive.type = raid_mapping[xml_input.find('Layout').text]
-
+    values = _extract(xml_input, LOGICAL_DRIVE_SCHEMA,
+                      exceptions.LogicalDriveError)
+    for name, value in values.items():
+        setattr(logical_drive, name, value)
     return logical_drive
 
 
@@ -132,28 +238,12 @@ def _parse_physical_drive(xml_input, physical_drive):
     :param xml_input: The xml to parse.
     :param physical_drive: The physical drive object to act on.
     """
-    physical_drive.id = '{0}:0:{1}'.format(xml_input.find('Channel').text,
-                        xml_input.find('TargetID').text)
-    physical_drive.firmware = xml_input.find('Revision').text
-    # For some reason the perc controller reports size in decimal, not binary
-    physical_drive.size = int(xml_input.find('Length').text) / 1000000000000
-    physical_drive.model = xml_input.find('ProductID').text
-    physical_drive.serial = xml_input.find('DeviceSerialNumber').text
-
-    state_mapping = {
-        '1': "Ready",
-        '2': "Failed",
-        '4': "Online"
-    }
-    physical_drive.state = state_mapping[xml_input.find('ObjState').text]
-
-    status_mapping = {
-        '2': "Ok",  # Ok
-        '3': "Non-Critical",  # Non-Critical
-        '4': "Failed"
-    }
-    physical_drive.status = status_mapping[xml_input.find('ObjStatus').text]
-
+    values = _extract(xml_input, PHYSICAL_DRIVE_SCHEMA,
+                      exceptions.PhysicalDriveError)
+    physical_drive.id = '{0}:0:{1}'.format(values.pop('channel'),
+                                           values.pop('target_id'))
+    for name, value in values.items():
+        setattr(physical_drive, name, value)
     return physical_drive
 
 
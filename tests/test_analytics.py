@@ -0,0 +1,112 @@
+import unittest
+
+from storage_controllers.common import analytics, inventory
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def _drive(drive_id, model, firmware, size, status):
+    return {
+        'controller_id': '0',
+        'firmware': firmware,
+        'id': drive_id,
+        'model': model,
+        'serial': 'S{0}'.format(drive_id),
+        'size': size,
+        'state': 'Online',
+        'status': status
+    }
+
+
+FLEET = {
+    'node1': [_drive('0:0:1', 'ST4000', 'A1', 4, 'Ok'),
+              _drive('0:0:2', 'ST4000', 'A1', 4, 'Failed'),
+              _drive('0:0:3', 'WD6000', 'B2', None, 'Ok')],
+    'node2': _drive('0:0:1', 'ST4000', 'B2', 4, 'Failed'),
+    'node3': {'controller': '0', 'status': 'Failed to get information for '
+                                           'physical drives'}
+}
+
+
+@unittest.skipIf(inventory.np is None, 'NumPy is not installed')
+class InventoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.inv = inventory.physical_drives(FLEET)
+
+    def test_flatten(self):
+        records, skipped = inventory.flatten(FLEET)
+        self.assertEqual(len(records), 4)
+        self.assertEqual(skipped, ['node3'])
+        self.assertEqual(set(r['minion'] for r in records),
+                         set(['node1', 'node2']))
+
+    def test_decode(self):
+        self.assertEqual(sorted(self.inv.decode('model').tolist()),
+                         ['ST4000', 'ST4000', 'ST4000', 'WD6000'])
+        self.assertEqual(self.inv.skipped, ['node3'])
+
+    def test_count_by(self):
+        groups = analytics.count_by(self.inv, ['minion', 'model', 'firmware'])
+        counts = dict(((g['minion'], g['model'], g['firmware']), g['drives'])
+                      for g in groups)
+        self.assertEqual(counts, {
+            ('node1', 'ST4000', 'A1'): 2,
+            ('node1', 'WD6000', 'B2'): 1,
+            ('node2', 'ST4000', 'B2'): 1
+        })
+
+    def test_failure_rate(self):
+        groups = analytics.failure_rate(self.inv, ['model', 'firmware'])
+        rates = dict(((g['model'], g['firmware']),
+                      (g['drives'], g['failed'], g['rate'])) for g in groups)
+        self.assertEqual(rates, {
+            ('ST4000', 'A1'): (2, 1, 0.5),
+            ('ST4000', 'B2'): (1, 1, 1.0),
+            ('WD6000', 'B2'): (1, 0, 0.0)
+        })
+
+    def test_capacity_by(self):
+        groups = analytics.capacity_by(self.inv, ['model'])
+        capacity = dict((g['model'], (g['drives'], g['unsized'],
+                                      g['capacity'])) for g in groups)
+        self.assertEqual(capacity, {
+            'ST4000': (3, 0, 12.0),
+            'WD6000': (1, 1, 0.0)
+        })
+
+    def test_health_summary(self):
+        summary = analytics.health_summary(self.inv)
+        self.assertEqual(summary['drives'], 4)
+        self.assertEqual(summary['skipped'], ['node3'])
+        self.assertEqual(summary['status'], {'Ok': 2, 'Failed': 2})
+
+    def test_empty(self):
+        inv = inventory.physical_drives({})
+        self.assertEqual(len(inv), 0)
+        self.assertEqual(analytics.count_by(inv, ['model', 'firmware']), [])
+        self.assertEqual(analytics.failure_rate(inv), [])
+        self.assertEqual(analytics.health_summary(inv)['drives'], 0)
+
+    def test_logical_drives(self):
+        inv = inventory.logical_drives({'node1': [{
+            'controller_id': '0',
+            'device_path': '/dev/sdb',
+            'id': '1',
+            'name': 'c0u1',
+            'physical_drives': ['0:0:1', '0:0:2'],
+            'status': 'Online',
+            'type': 'RAID-1'
+        }]})
+        self.assertEqual(inv.data['physical_drives'].tolist(), [2])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_to_arrow(self):
+        table = self.inv.to_arrow()
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(table.column('model').to_pylist(),
+                         self.inv.decode('model').tolist())
+        self.assertTrue(pyarrow.types.is_dictionary(
+            table.schema.field('status').type))
@@ -0,0 +1,64 @@
+import unittest
+import xml.etree.ElementTree as ET
+
+from storage_controllers.common import exceptions
+from storage_controllers.controllers import perc8xx
+
+
+PHYSICAL_DRIVE = '''<DCStorageObject>
+    <Channel>1</Channel>
+    <TargetID>5</TargetID>
+    <Revision>GS0F</Revision>
+    <Length>4000787030016</Length>
+    <ProductID>ST4000NM0023</ProductID>
+    <DeviceSerialNumber>Z1Z0ABCD</DeviceSerialNumber>
+    <ObjState>99</ObjState>
+    <ObjStatus>2</ObjStatus>
+</DCStorageObject>'''
+
+LOGICAL_DRIVE = '''<DCStorageObject>
+    <LogicalDriveNum>3</LogicalDriveNum>
+    <DeviceName>/dev/sdd</DeviceName>
+    <ObjStatus>3</ObjStatus>
+    <Layout>64</Layout>
+</DCStorageObject>'''
+
+
+class ParsePhysicalDriveTestCase(unittest.TestCase):
+    def test_parse(self):
+        drive = perc8xx._parse_physical_drive(ET.fromstring(PHYSICAL_DRIVE),
+                                              perc8xx.PhysicalDrive())
+        self.assertEqual(drive.id, '1:0:5')
+        self.assertEqual(drive.firmware, 'GS0F')
+        self.assertEqual(drive.model, 'ST4000NM0023')
+        self.assertEqual(drive.serial, 'Z1Z0ABCD')
+        self.assertEqual(drive.status, 'Ok')
+
+    def test_unknown_state(self):
+        drive = perc8xx._parse_physical_drive(ET.fromstring(PHYSICAL_DRIVE),
+                                              perc8xx.PhysicalDrive())
+        self.assertEqual(drive.state, '99')
+
+    def test_missing_element(self):
+        xml_input = ET.fromstring(PHYSICAL_DRIVE)
+        xml_input.remove(xml_input.find('Revision'))
+        self.assertRaises(exceptions.PhysicalDriveError,
+                          perc8xx._parse_physical_drive, xml_input,
+                          perc8xx.PhysicalDrive())
+
+
+class ParseLogicalDriveTestCase(unittest.TestCase):
+    def test_parse(self):
+        drive = perc8xx._parse_logical_drive(ET.fromstring(LOGICAL_DRIVE),
+                                             perc8xx.LogicalDrive())
+        self.assertEqual(drive.id, '3')
+        self.assertEqual(drive.device_path, '/dev/sdd')
+        self.assertEqual(drive.status, 'Degraded')
+        self.assertEqual(drive.type, 'RAID-5')
+
+    def test_missing_element(self):
+        xml_input = ET.fromstring(LOGICAL_DRIVE)
+        xml_input.remove(xml_input.find('Layout'))
+        self.assertRaises(exceptions.LogicalDriveError,
+                          perc8xx._parse_logical_drive, xml_input,
+                          perc8xx.LogicalDrive())